@@ -1,115 +1,247 @@
 import cv2
 import time
+import queue
+import threading
 import numpy as np
 from utils import preprocess_frame, find_largest_contour, count_fingers
 
+# Processing resolution (width, height) of every captured frame
+FRAME_SIZE = (640, 480)
 
-def main():
+
+def put_latest(q: queue.Queue, item) -> None:
     """
-    Main function for realtime finger counting demo using webcam.
+    Put item into a single-slot queue, dropping the stale item if present.
+
+    Args:
+        q: Queue created with maxsize=1
+        item: Item to publish as the newest value
     """
-    print("Starting finger counting demo...")
-    print("Controls: 'q' to quit, 's' to save screenshot")
-    
-    # Initialize webcam
-    cap = cv2.VideoCapture(0)
-    
-    if not cap.isOpened():
-        print("Error: Could not open webcam")
-        return
-    
-    print("Webcam opened successfully")
-    
-    # Variables for FPS calculation
-    fps_counter = 0
-    fps_start_time = time.time()
-    current_fps = 0
-    
-    # Screenshot counter for unique filenames
-    screenshot_count = 0
-    
-    while True:
-        # Read frame from webcam
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+
+def run_stage(stage, errors: queue.Queue, stop_event: threading.Event, *args) -> None:
+    """
+    Thread target running one pipeline stage.
+
+    Any exception is handed to the main thread through errors, and the whole
+    pipeline is stopped when the stage exits for any reason, so a crashed
+    thread cannot leave the display loop waiting forever.
+
+    Args:
+        stage: Stage function (capture_loop or process_loop)
+        errors: Queue receiving exceptions raised by the stage
+        stop_event: Event signalling all threads to shut down
+        *args: Arguments passed to the stage
+    """
+    try:
+        stage(*args)
+    except Exception as e:
+        errors.put(e)
+    finally:
+        stop_event.set()
+
+
+def capture_loop(cap: cv2.VideoCapture, frames: queue.Queue, stop_event: threading.Event) -> None:
+    """
+    Capture thread: read, mirror and resize webcam frames.
+
+    Args:
+        cap: Opened webcam capture
+        frames: Single-slot queue receiving the newest prepared frame
+        stop_event: Event signalling all threads to shut down
+    """
+    while not stop_event.is_set():
         ret, frame = cap.read()
         if not ret:
             print("Error: Failed to read frame from webcam")
+            stop_event.set()
             break
-        
+
         # Flip frame horizontally for mirror effect
         frame = cv2.flip(frame, 1)
-        
+
         # Resize frame for better performance
-        frame = cv2.resize(frame, (640, 480))
-        
+        frame = cv2.resize(frame, FRAME_SIZE)
+
+        put_latest(frames, frame)
+
+
+def process_loop(frames: queue.Queue, results: queue.Queue, stop_event: threading.Event,
+                 show_mask: threading.Event) -> None:
+    """
+    Worker thread: detect the hand, count fingers and annotate the frame.
+
+    Args:
+        frames: Single-slot queue of prepared webcam frames
+        results: Single-slot queue receiving the newest annotated frame
+        stop_event: Event signalling all threads to shut down
+        show_mask: Event set while the skin mask preview should be drawn
+    """
+    # Variables for FPS calculation
+    fps_counter = 0
+    fps_start_time = time.time()
+    fps_text = 'FPS: 0'
+
+    # Reused skin mask buffer so the hot loop does not allocate per frame
+    mask_buffer = np.empty((FRAME_SIZE[1], FRAME_SIZE[0]), dtype=np.uint8)
+
+    while not stop_event.is_set():
+        try:
+            frame = frames.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
         # Get skin mask using utils function
-        mask = preprocess_frame(frame, method='ycrcb')
-        
+        mask = preprocess_frame(frame, method='ycrcb', out=mask_buffer)
+
         # Find largest contour (hand)
         contour = find_largest_contour(mask)
-        
+
         finger_count = 0
-        
+
         # Count fingers if hand contour is found
         if contour is not None:
             finger_count, frame = count_fingers(contour, frame)
-        
+
         # Display finger count text
-        cv2.putText(frame, f'Fingers: {finger_count}', (10, 30), 
+        cv2.putText(frame, f'Fingers: {finger_count}', (10, 30),
                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
+
         # Calculate and display FPS
         fps_counter += 1
         if fps_counter % 10 == 0:  # Update FPS every 10 frames
             fps_end_time = time.time()
             current_fps = 10 / (fps_end_time - fps_start_time)
             fps_start_time = fps_end_time
-        
-        cv2.putText(frame, f'FPS: {current_fps:.1f}', (10, 70), 
+            # Format only when the value changes, not every frame
+            fps_text = "FPS: %d" % int(current_fps)
+
+        cv2.putText(frame, fps_text, (10, 70),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-        
-        # Create small mask display for assistance
-        mask_small = cv2.resize(mask, (160, 120))  # Quarter size
-        mask_colored = cv2.cvtColor(mask_small, cv2.COLOR_GRAY2BGR)
-        
-        # Position mask display at top-right corner
-        frame[10:130, 470:630] = mask_colored
-        
-        # Add border around mask display
-        cv2.rectangle(frame, (470, 10), (630, 130), (255, 255, 255), 2)
-        cv2.putText(frame, 'Skin Mask', (475, 145), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        
+
+        if show_mask.is_set():
+            # Create small mask display for assistance
+            mask_small = cv2.resize(mask, (160, 120))  # Quarter size
+            mask_colored = cv2.cvtColor(mask_small, cv2.COLOR_GRAY2BGR)
+
+            # Position mask display at top-right corner
+            frame[10:130, 470:630] = mask_colored
+
+            # Add border around mask display
+            cv2.rectangle(frame, (470, 10), (630, 130), (255, 255, 255), 2)
+            cv2.putText(frame, 'Skin Mask', (475, 145),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
         # Add instructions text
-        cv2.putText(frame, "Press 'q' to quit, 's' to save", (10, 460), 
+        cv2.putText(frame, "Press 'q' to quit, 's' to save, 'm' for mask", (10, 460),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-        
-        # Display the frame
-        cv2.imshow('Finger Counting Demo', frame)
-        
-        # Handle key presses
-        key = cv2.waitKey(1) & 0xFF
-        
-        if key == ord('q'):
-            print("Quit key pressed. Exiting...")
-            break
-        elif key == ord('s'):
-            # Save screenshot
-            screenshot_count += 1
-            filename = f'screenshot_{screenshot_count:03d}.jpg'
-            cv2.imwrite(filename, frame)
-            print(f"Screenshot saved as {filename}")
-            
-            # Show brief save confirmation on frame
-            save_frame = frame.copy()
-            cv2.putText(save_frame, 'SAVED!', (250, 240), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3)
-            cv2.imshow('Finger Counting Demo', save_frame)
-            cv2.waitKey(500)  # Show for 500ms
-    
+
+        put_latest(results, frame)
+
+
+def main():
+    """
+    Main function for realtime finger counting demo using webcam.
+
+    Capture, processing and display run on separate threads connected by
+    single-slot queues, so grabbing the next frame overlaps with processing
+    the current one and the display always shows the newest result.
+    """
+    print("Starting finger counting demo...")
+    print("Controls: 'q' to quit, 's' to save screenshot, 'm' to toggle skin mask")
+
+    # Initialize webcam
+    cap = cv2.VideoCapture(0)
+
+    if not cap.isOpened():
+        print("Error: Could not open webcam")
+        return
+
+    # Keep the driver queue short so grabbed frames are never seconds old
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    print("Webcam opened successfully")
+
+    # Pipeline: capture thread -> worker thread -> main (display) thread
+    frames = queue.Queue(maxsize=1)
+    results = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
+    # Exceptions from the capture/worker threads, re-raised in this thread
+    errors = queue.Queue()
+    # Skin mask preview is hidden by default; toggled with 'm'
+    show_mask = threading.Event()
+
+    threads = [
+        threading.Thread(target=run_stage, daemon=True,
+                         args=(capture_loop, errors, stop_event, cap, frames, stop_event)),
+        threading.Thread(target=run_stage, daemon=True,
+                         args=(process_loop, errors, stop_event, frames, results, stop_event, show_mask)),
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Screenshot counter for unique filenames
+    screenshot_count = 0
+
+    # Most recently displayed frame, used for screenshots
+    frame = None
+
+    try:
+        while not stop_event.is_set():
+            # Wait for the next annotated frame from the worker; if none is
+            # ready yet, still poll keys so presses are not lost
+            try:
+                frame = results.get(timeout=0.1)
+                # Display the frame
+                cv2.imshow('Finger Counting Demo', frame)
+            except queue.Empty:
+                pass
+
+            # Handle key presses
+            key = cv2.waitKey(1) & 0xFF
+
+            if key == ord('q'):
+                print("Quit key pressed. Exiting...")
+                break
+            elif key == ord('s') and frame is not None:
+                # Save screenshot
+                screenshot_count += 1
+                filename = f'screenshot_{screenshot_count:03d}.jpg'
+                cv2.imwrite(filename, frame)
+                print(f"Screenshot saved as {filename}")
+
+                # Show brief save confirmation on frame
+                save_frame = frame.copy()
+                cv2.putText(save_frame, 'SAVED!', (250, 240),
+                           cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3)
+                cv2.imshow('Finger Counting Demo', save_frame)
+                cv2.waitKey(500)  # Show for 500ms
+            elif key == ord('m'):
+                # Toggle skin mask preview
+                if show_mask.is_set():
+                    show_mask.clear()
+                else:
+                    show_mask.set()
+    finally:
+        # Stop capture and worker threads before releasing the camera
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=1.0)
+
     # Cleanup
     print("Releasing camera and closing windows...")
     cap.release()
     cv2.destroyAllWindows()
+
+    # Surface a crash in a pipeline thread to the caller
+    if not errors.empty():
+        raise errors.get()
+
     print("Demo ended successfully")
 
 
@@ -2,52 +2,159 @@ import cv2
 import numpy as np
 from typing import Optional, Tuple
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to OpenCV
+    NUMBA_AVAILABLE = False
 
-def preprocess_frame(frame: np.ndarray, method: str = 'ycrcb') -> np.ndarray:
+# Elliptical structuring element for mask cleanup, built once at import
+_KERNEL_5 = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+# Skin tone ranges per color space: (conversion code, lower, upper)
+_SKIN_RANGES = {
+    # YCrCb color space is effective for skin detection
+    'ycrcb': (cv2.COLOR_BGR2YCrCb,
+              np.array([0, 133, 77], dtype=np.uint8),
+              np.array([255, 173, 127], dtype=np.uint8)),
+    # HSV color space alternative
+    'hsv': (cv2.COLOR_BGR2HSV,
+            np.array([0, 20, 70], dtype=np.uint8),
+            np.array([20, 255, 255], dtype=np.uint8)),
+}
+
+# Preallocated per-frame buffers keyed by (name, shape)
+_BUFS = {}
+
+
+def _get_buffer(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Return a reusable uint8 work buffer, allocating it on first use.
+    
+    Args:
+        name: Role of the buffer in the pipeline (e.g. 'mask', 'converted')
+        shape: Required array shape
+        
+    Returns:
+        uint8 array of the given shape, shared across calls
+    """
+    key = (name, shape)
+    buf = _BUFS.get(key)
+    if buf is None:
+        buf = _BUFS[key] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def skin_mask_ycrcb(bgr: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Fused BGR -> YCrCb conversion and skin thresholding in a single pass.
+        
+        Uses the same fixed-point coefficients as OpenCV's 8-bit COLOR_BGR2YCrCb
+        path, so the result matches cvtColor + inRange with the YCrCb skin range
+        without materializing the intermediate 3-channel image.
+        
+        Args:
+            bgr: Input BGR image as contiguous uint8 array of shape (H, W, 3)
+            out: Preallocated uint8 array of shape (H, W) receiving the mask
+            
+        Returns:
+            The out array, with 255 for skin pixels and 0 elsewhere
+        """
+        height, width = out.shape
+        for i in prange(height):
+            for j in range(width):
+                b = np.int32(bgr[i, j, 0])
+                g = np.int32(bgr[i, j, 1])
+                r = np.int32(bgr[i, j, 2])
+                # Y = 0.299 R + 0.587 G + 0.114 B (14-bit fixed point)
+                y = (4899 * r + 9617 * g + 1868 * b + 8192) >> 14
+                # Cr = (R - Y) * 0.713 + 128, Cb = (B - Y) * 0.564 + 128
+                cr = ((r - y) * 11682 + (128 << 14) + 8192) >> 14
+                cb = ((b - y) * 9241 + (128 << 14) + 8192) >> 14
+                if 133 <= cr <= 173 and 77 <= cb <= 127:
+                    out[i, j] = 255
+                else:
+                    out[i, j] = 0
+        return out
+
+
+def preprocess_frame(frame: np.ndarray, method: str = 'ycrcb',
+                     out: Optional[np.ndarray] = None,
+                     work_scale: float = 0.5) -> np.ndarray:
     """
     Convert BGR frame to a binary skin mask using color space filtering.
     
     Args:
         frame: Input BGR image as numpy array
         method: Color space method ('ycrcb' or 'hsv') for skin detection
+        out: Optional preallocated uint8 (H, W) buffer for the skin mask,
+             matching the frame's height and width; a module-level buffer
+             is used when omitted
+        work_scale: Factor applied to both frame dimensions for the color
+                    filtering and morphology (aspect ratio is preserved); the
+                    mask is scaled back to the frame size afterwards. 1.0
+                    processes the frame at full resolution.
         
     Returns:
-        Binary mask (uint8) where white pixels represent detected skin
+        Binary mask (uint8) with the frame's height and width, where white
+        pixels represent detected skin. The array is reused by the next call
+        with the same shape, so copy it if it must outlive the current frame.
         
     Raises:
-        ValueError: If method is not 'ycrcb' or 'hsv'
+        ValueError: If method is not 'ycrcb' or 'hsv', or out does not match
+                    the frame's height and width or is not uint8
     """
     if method not in ['ycrcb', 'hsv']:
         raise ValueError("Method must be 'ycrcb' or 'hsv'")
     
+    height, width = frame.shape[:2]
+    if out is not None and (out.shape != (height, width) or out.dtype != np.uint8):
+        raise ValueError(f"out must be a uint8 array of shape {(height, width)}, "
+                         f"got {out.dtype} array of shape {out.shape}")
+    
+    # Downscale first: hull/defect analysis does not need full-res skin edges
+    work_width = max(1, int(round(width * work_scale)))
+    work_height = max(1, int(round(height * work_scale)))
+    if (work_width, work_height) != (width, height):
+        small = cv2.resize(frame, (work_width, work_height),
+                           dst=_get_buffer('small', (work_height, work_width, 3)),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        small = frame
+    small_shape = small.shape[:2]
+    
+    # Raw mask buffer; write straight into out when no rescaling is needed
+    if small is frame and out is not None:
+        raw = out
+    else:
+        raw = _get_buffer('mask', small_shape)
+    
     # Convert color space and apply skin detection
-    if method == 'ycrcb':
-        # YCrCb color space is effective for skin detection
-        converted = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
-        # Skin tone ranges in YCrCb
-        lower_skin = np.array([0, 133, 77], dtype=np.uint8)
-        upper_skin = np.array([255, 173, 127], dtype=np.uint8)
-    else:  # hsv method
-        # HSV color space alternative
-        converted = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        # Skin tone ranges in HSV
-        lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-    
-    # Create binary mask based on color range
-    mask = cv2.inRange(converted, lower_skin, upper_skin)
-    
-    # Apply Gaussian blur to smooth the mask
-    mask = cv2.GaussianBlur(mask, (5, 5), 0)
-    
-    # Morphological operations to clean up noise
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+    if method == 'ycrcb' and NUMBA_AVAILABLE:
+        # Fused conversion + thresholding, no intermediate YCrCb image
+        mask = skin_mask_ycrcb(np.ascontiguousarray(small), raw)
+    else:
+        code, lower_skin, upper_skin = _SKIN_RANGES[method]
+        converted = cv2.cvtColor(small, code, dst=_get_buffer('converted', small.shape))
+        # Create binary mask based on color range
+        mask = cv2.inRange(converted, lower_skin, upper_skin, dst=raw)
     
+    # Morphological operations to clean up noise (no blur needed beforehand,
+    # opening and closing already smooth the binary mask)
     # Opening: removes small noise
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=2)
+    cleaned = cv2.morphologyEx(mask, cv2.MORPH_OPEN, _KERNEL_5,
+                               dst=_get_buffer('cleaned', small_shape), iterations=2)
+    
+    # Closing: fills small holes (written back over the raw mask)
+    mask = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, _KERNEL_5, dst=mask, iterations=2)
     
-    # Closing: fills small holes
-    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=2)
+    # Scale the mask back up to frame resolution for contour analysis
+    if small is not frame:
+        if out is None:
+            out = _get_buffer('upscaled', (height, width))
+        mask = cv2.resize(mask, (width, height), dst=out, interpolation=cv2.INTER_NEAREST)
     
     return mask
 
@@ -63,19 +170,22 @@ def find_largest_contour(mask: np.ndarray) -> Optional[np.ndarray]:
         Largest contour as numpy array, or None if no contours found
     """
     # Find all contours in the binary mask
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # TC89_L1 approximation keeps fewer vertices on curved outlines than
+    # CHAIN_APPROX_SIMPLE, which speeds up hull and defect computation
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_L1)
     
     if not contours:
         return None
     
-    # Find contour with maximum area
-    largest_contour = max(contours, key=cv2.contourArea)
+    # Find contour with maximum area, computing each area only once
+    areas = [cv2.contourArea(c) for c in contours]
+    idx = int(np.argmax(areas))
     
     # Return None if the largest contour is too small (likely noise)
-    if cv2.contourArea(largest_contour) < 1000:
+    if areas[idx] < 1000:
         return None
         
-    return largest_contour
+    return contours[idx]
 
 
 def count_fingers(contour: np.ndarray, drawing: Optional[np.ndarray] = None) -> Tuple[int, np.ndarray]:
@@ -84,23 +194,21 @@ def count_fingers(contour: np.ndarray, drawing: Optional[np.ndarray] = None) ->
     
     Args:
         contour: Hand contour as numpy array
-        drawing: Optional image to draw results on (will be copied if provided)
+        drawing: Optional image to draw results on (modified in place if provided)
         
     Returns:
         Tuple of (finger_count, drawing_image)
         - finger_count: Number of detected fingers (0-5)
-        - drawing_image: Image with visual annotations (copy of input or black image)
+        - drawing_image: Image with visual annotations (the input image or a new black image)
     """
-    # Create drawing canvas if not provided
-    if drawing is not None:
-        drawing = drawing.copy()
-    else:
-        # Create black image for visualization
+    # Create black canvas for visualization if no image was provided
+    if drawing is None:
         drawing = np.zeros((480, 640, 3), dtype=np.uint8)
     
     # Compute convex hull
     hull_indices = cv2.convexHull(contour, returnPoints=False)
-    hull_points = cv2.convexHull(contour, returnPoints=True)
+    # Reuse the indices for the drawable hull instead of a second hull pass
+    hull_points = contour[hull_indices[:, 0]].reshape(-1, 1, 2)
     
     # Draw contour and hull for visualization
     cv2.drawContours(drawing, [contour], -1, (0, 255, 0), 2)  # Green contour
@@ -116,37 +224,44 @@ def count_fingers(contour: np.ndarray, drawing: Optional[np.ndarray] = None) ->
     if defects is None:
         return 0, drawing
     
-    finger_count = 0
+    # Analyze all defects at once to identify valleys between fingers
+    start_idx = defects[:, 0, 0]
+    end_idx = defects[:, 0, 1]
+    far_idx = defects[:, 0, 2]
+    depth = defects[:, 0, 3]
     
-    # Analyze each defect to identify finger tips
-    for i in range(defects.shape[0]):
-        start_idx, end_idx, far_idx, depth = defects[i, 0]
-        
-        # Get the actual points
-        start_point = tuple(contour[start_idx][0])
-        end_point = tuple(contour[end_idx][0])
-        far_point = tuple(contour[far_idx][0])
-        
-        # Calculate distances for angle computation
-        a = np.linalg.norm(np.array(start_point) - np.array(end_point))
-        b = np.linalg.norm(np.array(start_point) - np.array(far_point))
-        c = np.linalg.norm(np.array(end_point) - np.array(far_point))
+    # Get the actual points, shape (N, 2); float64 keeps the angle test
+    # bit-identical to the per-defect scalar computation
+    start_points = contour[start_idx, 0].astype(np.float64)
+    end_points = contour[end_idx, 0].astype(np.float64)
+    far_points = contour[far_idx, 0].astype(np.float64)
+    
+    # Calculate distances for angle computation (sqrt of the exact integer
+    # sum of squares, same result as np.linalg.norm per point pair)
+    a = np.sqrt(((start_points - end_points) ** 2).sum(axis=1))
+    b = np.sqrt(((start_points - far_points) ** 2).sum(axis=1))
+    c = np.sqrt(((end_points - far_points) ** 2).sum(axis=1))
+    
+    # Calculate angle using law of cosines, skipping degenerate triangles.
+    # arccos is kept rather than testing cos > 0: near 90 degrees the rounded
+    # angle decides, e.g. 1-px staircase notches land at 89.999... degrees.
+    # Out-of-range cosines give NaN and are rejected, as before.
+    nonzero = (b != 0) & (c != 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_angle = (b**2 + c**2 - a**2) / (2 * b * c)
+        angle_deg = np.degrees(np.arccos(cos_angle))
+    
+    # Filter defects: depth > 20 pixels and angle < 90 degrees
+    # These criteria help identify valleys between fingers
+    valid = nonzero & (depth > 20) & (angle_deg < 90)
+    finger_count = int(valid.sum())
+    
+    for i in np.flatnonzero(valid):
+        # Draw defect point (valley between fingers)
+        cv2.circle(drawing, tuple(contour[far_idx[i]][0]), 5, (255, 0, 0), -1)  # Blue dot
         
-        # Calculate angle using law of cosines
-        if b != 0 and c != 0:
-            angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c))
-            angle_deg = np.degrees(angle)
-            
-            # Filter defects: depth > 20 pixels and angle < 90 degrees
-            # These criteria help identify valleys between fingers
-            if depth > 20 and angle_deg < 90:
-                finger_count += 1
-                
-                # Draw defect point (valley between fingers)
-                cv2.circle(drawing, far_point, 5, (255, 0, 0), -1)  # Blue dot
-                
-                # Draw finger tip circles
-                cv2.circle(drawing, start_point, 8, (255, 255, 0), -1)  # Cyan circle
+        # Draw finger tip circles
+        cv2.circle(drawing, tuple(contour[start_idx[i]][0]), 8, (255, 255, 0), -1)  # Cyan circle
     
     # Finger count is typically defects + 1 (but cap at 5)
     finger_count = min(finger_count + 1, 5)
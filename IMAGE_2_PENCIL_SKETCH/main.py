@@ -188,12 +188,20 @@ class ImageSketchApp:
         if scale_factor < 1.0:
             new_width = int(img_width * scale_factor)
             new_height = int(img_height * scale_factor)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Convert to PhotoImage and display
-        photo = ImageTk.PhotoImage(image)
+            # Bilinear is plenty for an on-screen preview and much cheaper than Lanczos
+            image = image.resize((new_width, new_height), Image.Resampling.BILINEAR)
+        
+        # Reuse the label's PhotoImage when size and mode match, else create one
+        # (paste converts to the PhotoImage's mode, which would lose color/alpha)
+        photo = getattr(label, 'image', None)
+        if (photo is not None and getattr(label, 'image_mode', None) == image.mode
+                and (photo.width(), photo.height()) == image.size):
+            photo.paste(image)
+        else:
+            photo = ImageTk.PhotoImage(image)
         label.configure(image=photo, text="")
         label.image = photo  # Keep reference to prevent garbage collection
+        label.image_mode = image.mode
     
     def _save_sketch(self) -> None:
         """Save the current sketch to file."""
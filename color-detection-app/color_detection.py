@@ -1,29 +1,35 @@
 import cv2
+import numpy as np
 import pandas as pd
 
 # Load colors CSV
 csv_path = 'colors.csv'
 colors = pd.read_csv(csv_path)
 
+# Palette as plain NumPy arrays for vectorized lookups
+_R = colors["R"].to_numpy(np.int16)
+_G = colors["G"].to_numpy(np.int16)
+_B = colors["B"].to_numpy(np.int16)
+_NAMES = colors["color_name"].to_numpy()
+
 # Function to get color name
 def get_color_name(R, G, B):
-    minimum = 10000
-    cname = ""
-    for i in range(len(colors)):
-        d = abs(R - int(colors.loc[i, "R"])) + abs(G - int(colors.loc[i, "G"])) + abs(B - int(colors.loc[i, "B"]))
-        if d <= minimum:
-            minimum = d
-            cname = colors.loc[i, "color_name"]
-    return cname
+    # Manhattan distance to every palette entry in one pass
+    d = np.abs(_R - R) + np.abs(_G - G) + np.abs(_B - B)
+    # On ties prefer the last matching entry, as the original loop did
+    return _NAMES[len(d) - 1 - d[::-1].argmin()]
 
 # Mouse click event
 clicked = False
+# Window needs redrawing; True for the initial draw
+dirty = True
 r = g = b = xpos = ypos = 0
 
 def draw_function(event, x, y, flags, param):
-    global b, g, r, xpos, ypos, clicked
+    global b, g, r, xpos, ypos, clicked, dirty
     if event == cv2.EVENT_LBUTTONDOWN:
         clicked = True
+        dirty = True
         xpos = x
         ypos = y
         b, g, r = img[y, x]
@@ -36,7 +42,6 @@ cv2.namedWindow('Image')
 cv2.setMouseCallback('Image', draw_function)
 
 while True:
-    cv2.imshow("Image", img)
     if clicked:
         # Create color rectangle
         cv2.rectangle(img, (20, 20), (750, 60), (b, g, r), -1)
@@ -45,8 +50,14 @@ while True:
         text_color = (255, 255, 255) if r+g+b < 400 else (0, 0, 0)
         cv2.putText(img, text, (50, 50), 2, 0.8, text_color, 2, cv2.LINE_AA)
         clicked = False
+        dirty = True
+
+    # Only redraw the window when the image actually changed
+    if dirty:
+        cv2.imshow("Image", img)
+        dirty = False
 
-    if cv2.waitKey(20) & 0xFF == 27:  # press ESC to exit
+    if cv2.waitKey(30) & 0xFF == 27:  # press ESC to exit
         break
 
 cv2.destroyAllWindows()